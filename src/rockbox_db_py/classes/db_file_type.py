@@ -115,17 +115,26 @@ class RockboxDBFileType(Enum):
     @classmethod
     def from_filename(cls, filename):
         """Returns the RockboxDBFileType enum member for a given database filename."""
-        for file_type in cls:
-            if file_type.filename == filename:
-                return file_type
-        raise ValueError(f"Unknown Rockbox database file: {filename}")
+        try:
+            return _FILE_TYPES_BY_FILENAME[filename]
+        except KeyError:
+            raise ValueError(f"Unknown Rockbox database file: {filename}") from None
 
     @classmethod
     def from_tag_index(cls, tag_index):
         """Returns the RockboxDBFileType enum member for a given tag index."""
-        for file_type in cls:
-            if file_type.tag_index == tag_index:
-                return file_type
-        raise ValueError(
-            f"No Rockbox database file associated with tag index: {tag_index}"
-        )
+        try:
+            return _FILE_TYPES_BY_TAG_INDEX[tag_index]
+        except KeyError:
+            raise ValueError(
+                f"No Rockbox database file associated with tag index: {tag_index}"
+            ) from None
+
+
+# The mappings are static, so build the lookups once rather than scanning the enum.
+_FILE_TYPES_BY_TAG_INDEX = {
+    file_type.tag_index: file_type for file_type in RockboxDBFileType
+}
+_FILE_TYPES_BY_FILENAME = {
+    file_type.filename: file_type for file_type in RockboxDBFileType
+}
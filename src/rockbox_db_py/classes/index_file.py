@@ -6,13 +6,175 @@
 # It also manages the loading of associated TagFile objects for resolving the
 # other tag data.
 
+import array
 import os
-from typing import Optional, List, Dict
-
-from rockbox_db_py.utils.struct_helpers import read_uint32, write_uint32
-from rockbox_db_py.classes.index_file_entry import IndexFileEntry
+import struct
+from collections.abc import MutableSequence
+from typing import Optional, List, Dict, Iterator, Union
+
+from rockbox_db_py.utils.struct_helpers import ENDIANNESS_CHAR
+from rockbox_db_py.classes.index_file_entry import (
+    IndexFileEntry,
+    INDEX_ENTRY_SIZE,
+    decode_entry_table,
+)
 from rockbox_db_py.classes.db_file_type import RockboxDBFileType
 from rockbox_db_py.classes.tag_file import TagFile
+from rockbox_db_py.classes.tag_file_entry import TagFileEntry
+from rockbox_db_py.utils.defs import TAG_COUNT, TagTypeEnum, FLAG_DIRCACHE
+
+# Size of the master header: magic, datasize, entry_count, serial, commitid and dirty.
+INDEX_HEADER_SIZE = 6 * 4
+_HEADER_STRUCT = struct.Struct(f"{ENDIANNESS_CHAR}6I")
+
+
+def _entry_value(entry: IndexFileEntry, position: int) -> Union[int, TagFileEntry]:
+    """Returns tag_seek[position] of an entry, or its flag when position is TAG_COUNT."""
+    return entry.flag if position == TAG_COUNT else entry.tag_seek[position]
+
+
+class _EntriesView(MutableSequence):
+    """
+    List-like collection of IndexFileEntry objects, backed by the raw entry block of the file.
+
+    Entries are only constructed the first time they are accessed, and are then kept,
+    so any changes made to them persist like they would in a plain list. Entries that
+    are never accessed stay in their packed on-disk form, and are written back out
+    as-is. Structural changes other than appending (insert, delete, slice assignment,
+    sort) first construct every remaining entry, after which the raw data is no longer
+    needed.
+
+    It supports the rest of the list API too (sort, copy, + and comparison with lists),
+    so code using IndexFile.entries behaves the same whether the IndexFile was loaded
+    or built from scratch.
+    """
+
+    # Mutable, and compares equal to lists, so unhashable like a list.
+    __hash__ = None
+
+    def __init__(self, data: bytes, loaded_tag_files: Dict[int, TagFile]):
+        self._data: Optional[bytes] = data
+        self._loaded_tag_files: Dict[int, TagFile] = loaded_tag_files
+        self._entries: List[Optional[IndexFileEntry]] = [None] * (
+            len(data) // INDEX_ENTRY_SIZE
+        )
+
+    def _get(self, index: int) -> IndexFileEntry:
+        """Returns the entry at a (non-negative) index, constructing it if needed."""
+        entry: Optional[IndexFileEntry] = self._entries[index]
+        if entry is None:
+            entry = IndexFileEntry.from_buffer(
+                self._data,
+                index * INDEX_ENTRY_SIZE,
+                loaded_tag_files=self._loaded_tag_files,
+            )
+            self._entries[index] = entry
+        return entry
+
+    def _materialize_all(self) -> None:
+        """Constructs every remaining entry, so positions no longer map to the raw data."""
+        if self._data is None:
+            return
+        for index in range(len(self._entries)):
+            self._get(index)
+        self._data = None
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[IndexFileEntry, List[IndexFileEntry]]:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._entries)))]
+        if index < 0:
+            index += len(self._entries)
+        if not 0 <= index < len(self._entries):
+            raise IndexError("IndexFile entry index out of range")
+        return self._get(index)
+
+    def __setitem__(self, index: Union[int, slice], value) -> None:
+        if isinstance(index, slice):
+            self._materialize_all()
+        self._entries[index] = value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        self._materialize_all()
+        del self._entries[index]
+
+    def insert(self, index: int, value: IndexFileEntry) -> None:
+        # Appending doesn't shift existing rows, so the raw table can still be used.
+        if index < len(self._entries):
+            self._materialize_all()
+        self._entries.insert(index, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, _EntriesView)):
+            return len(self) == len(other) and all(
+                entry is other_entry or entry == other_entry
+                for entry, other_entry in zip(self, other)
+            )
+        return NotImplemented
+
+    def __add__(self, other: List[IndexFileEntry]) -> List[IndexFileEntry]:
+        if isinstance(other, (list, _EntriesView)):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other: List[IndexFileEntry]) -> List[IndexFileEntry]:
+        if isinstance(other, list):
+            return other + list(self)
+        return NotImplemented
+
+    def copy(self) -> List[IndexFileEntry]:
+        """Returns a shallow copy of the entries, as a plain list."""
+        return list(self)
+
+    def sort(self, *, key=None, reverse: bool = False) -> None:
+        """Sorts the entries in place, as list.sort does."""
+        self._materialize_all()
+        self._entries.sort(key=key, reverse=reverse)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._data = None
+
+    def column(self, position: int) -> List[Union[int, TagFileEntry]]:
+        """
+        Returns one value from every entry: tag_seek[position], or the flag when position
+        is TAG_COUNT. Entries that haven't been accessed are read from the raw data,
+        rather than being constructed.
+        """
+        if self._data is None:
+            return [_entry_value(entry, position) for entry in self._entries]
+
+        # The raw data is row-major, so a column is every (TAG_COUNT + 1)th value.
+        table: Union[memoryview, array.array] = decode_entry_table(self._data)
+        raw_column: Union[memoryview, array.array] = table[position :: TAG_COUNT + 1]
+        return [
+            raw_column[index] if entry is None else _entry_value(entry, position)
+            for index, entry in enumerate(self._entries)
+        ]
+
+    def pack_into(self, buffer: bytearray, offset: int) -> None:
+        """
+        Writes the raw bytes of every entry, in order, into buffer at offset. Entries
+        that were never accessed are copied straight from the original data rather
+        than re-packed.
+        """
+        if self._data is not None:
+            buffer[offset : offset + len(self._data)] = self._data
+
+        for index, entry in enumerate(self._entries):
+            if entry is not None:
+                entry.pack_into(buffer, offset + index * INDEX_ENTRY_SIZE)
+
+    def __iter__(self) -> Iterator[IndexFileEntry]:
+        for index in range(len(self._entries)):
+            yield self._get(index)
+
+    def __repr__(self) -> str:
+        return f"_EntriesView(len={len(self._entries)})"
 
 
 class IndexFile:
@@ -33,7 +195,7 @@ class IndexFile:
         self.serial: int = 0
         self.commitid: int = 1
         self.dirty: int = 0
-        self.entries: List[IndexFileEntry] = []
+        self.entries: MutableSequence[IndexFileEntry] = []
         self._loaded_tag_files: Dict[int, TagFile] = {}
 
     @classmethod
@@ -75,7 +237,9 @@ class IndexFile:
                 if ft != RockboxDBFileType.INDEX and ft.tag_index is not None
             ]
 
-        # Load the required TagFiles.
+        # Load the required TagFiles. They share one string cache, so values repeated
+        # across files share a string.
+        string_cache: Dict[str, str] = {}
         for db_type in tag_files_to_load:
             tag_filepath: str = os.path.join(db_directory, db_type.filename)
             if not os.path.exists(tag_filepath):
@@ -84,7 +248,9 @@ class IndexFile:
                 )
 
             try:
-                tag_file: TagFile = TagFile.from_file(tag_filepath)
+                tag_file: TagFile = TagFile.from_file(
+                    tag_filepath, string_cache=string_cache
+                )
                 index_file._loaded_tag_files[db_type.tag_index] = tag_file
             except Exception as e:
                 raise RuntimeError(
@@ -92,25 +258,37 @@ class IndexFile:
                 ) from e
 
         with open(filepath, "rb") as f:
+            header_data: bytes = f.read(INDEX_HEADER_SIZE)
+            if len(header_data) != INDEX_HEADER_SIZE:
+                raise ValueError(f"Not enough data in {filepath} for the index header.")
+
             # Read master header fields.
-            index_file.magic = read_uint32(f)
-            index_file.datasize = read_uint32(f)
-            index_file.entry_count = read_uint32(f)
-            index_file.serial = read_uint32(f)
-            index_file.commitid = read_uint32(f)
-            index_file.dirty = read_uint32(f)
+            (
+                index_file.magic,
+                index_file.datasize,
+                index_file.entry_count,
+                index_file.serial,
+                index_file.commitid,
+                index_file.dirty,
+            ) = _HEADER_STRUCT.unpack(header_data)
 
             if index_file.magic != RockboxDBFileType.INDEX.magic:
                 raise ValueError(
                     f"Invalid magic number in {filepath}. Expected {hex(RockboxDBFileType.INDEX.magic)}, got {hex(index_file.magic)}"
                 )
 
-            # Read IndexFileEntry objects, linking them to loaded TagFiles.
-            for _ in range(index_file.entry_count):
-                entry: IndexFileEntry = IndexFileEntry.from_file(
-                    f, loaded_tag_files=index_file._loaded_tag_files
+            # Read all IndexFileEntry data in one block, linking entries to loaded TagFiles.
+            entries_size: int = index_file.entry_count * INDEX_ENTRY_SIZE
+            entries_data: bytes = f.read(entries_size)
+            if len(entries_data) != entries_size:
+                raise ValueError(
+                    f"Not enough data in {filepath} for {index_file.entry_count} entries."
                 )
-                index_file.entries.append(entry)
+
+            # Entries are only built as they are accessed.
+            index_file.entries = _EntriesView(
+                entries_data, index_file._loaded_tag_files
+            )
 
         return index_file
 
@@ -125,10 +303,10 @@ class IndexFile:
         # This includes the IndexFile's own header and entries, and all associated TagFiles' content.
 
         # Size of IndexFile's own header.
-        calculated_total_db_size: int = 6 * 4
+        calculated_total_db_size: int = INDEX_HEADER_SIZE
 
         # Total size of IndexFile's entries.
-        calculated_total_db_size += sum(entry.size for entry in self.entries)
+        calculated_total_db_size += self.entry_count * INDEX_ENTRY_SIZE
 
         # Add the content sizes of all associated TagFiles (excluding filename).
         for tag_file_obj in self._loaded_tag_files.values():
@@ -140,25 +318,105 @@ class IndexFile:
         self.datasize = calculated_total_db_size
 
         with open(filepath, "wb") as f:
-            # Write master header fields.
-            write_uint32(f, self.magic)
-            write_uint32(f, self.datasize)
-            write_uint32(f, self.entry_count)
-            write_uint32(f, self.serial)
-            write_uint32(f, self.commitid)
-            write_uint32(f, self.dirty)
-
-            # Write each IndexFileEntry.
+            f.write(self.to_bytes())
+
+    def to_bytes(self) -> bytearray:
+        """
+        Serialises the master header and every IndexFileEntry into a single
+        preallocated buffer, so the file can be written with one call and no
+        per-entry bytes objects. The header fields are written as they currently
+        are; to_file recalculates them first.
+        """
+        buffer: bytearray = bytearray(
+            INDEX_HEADER_SIZE + len(self.entries) * INDEX_ENTRY_SIZE
+        )
+
+        # Write master header fields.
+        _HEADER_STRUCT.pack_into(
+            buffer,
+            0,
+            self.magic,
+            self.datasize,
+            self.entry_count,
+            self.serial,
+            self.commitid,
+            self.dirty,
+        )
+
+        # Write each IndexFileEntry.
+        if isinstance(self.entries, _EntriesView):
+            self.entries.pack_into(buffer, INDEX_HEADER_SIZE)
+        else:
+            offset: int = INDEX_HEADER_SIZE
             for entry in self.entries:
-                f.write(entry.to_bytes())
+                entry.pack_into(buffer, offset)
+                offset += INDEX_ENTRY_SIZE
+
+        return buffer
 
     def add_entry(self, entry: IndexFileEntry):
         """Adds an IndexFileEntry to this IndexFile."""
         self.entries.append(entry)
-        # Ensure new entries also get the reference to loaded TagFile objects for tag resolution.
+        # Link new entries to the shared loaded TagFile objects, for attribute-style tag access.
         entry._loaded_tag_files = self._loaded_tag_files
         return entry
 
+    def resolve_tag(
+        self, entry: IndexFileEntry, tag_enum: TagTypeEnum
+    ) -> Union[str, int, None]:
+        """
+        Resolves a tag value for an entry against this IndexFile's loaded TagFiles.
+        Unlike entry.get_parsed_tag_value, this works for any entry, including ones
+        that were never added to (or linked with) this IndexFile.
+        """
+        return entry.get_parsed_tag_value(
+            tag_enum, loaded_tag_files=self._loaded_tag_files
+        )
+
+    def _column(self, position: int) -> List[Union[int, TagFileEntry]]:
+        """Returns one raw value from every entry. See _EntriesView.column."""
+        if isinstance(self.entries, _EntriesView):
+            return self.entries.column(position)
+        return [_entry_value(entry, position) for entry in self.entries]
+
+    def tag_seek_column(self, tag_enum: TagTypeEnum) -> List[Union[int, TagFileEntry]]:
+        """
+        Returns the raw tag_seek value of a single tag for every entry, in entry order.
+        For a loaded database, entries that haven't been accessed are not constructed.
+
+        Args:
+            tag_enum: The TagTypeEnum member representing the desired tag.
+        """
+        return self._column(tag_enum.value)
+
+    def flag_column(self) -> List[int]:
+        """Returns the flag of every entry, in entry order. See tag_seek_column."""
+        return self._column(TAG_COUNT)
+
+    def entries_with_flag(self, flag_mask: int) -> List[int]:
+        """
+        Returns the positions of all entries with any of the given flag bits set.
+        For a loaded database this scans the flag values directly, rather than
+        constructing every entry.
+
+        Args:
+            flag_mask: One or more FLAG_* values OR'd together (e.g. FLAG_DELETED).
+        """
+        return [
+            index for index, flag in enumerate(self.flag_column()) if flag & flag_mask
+        ]
+
+    def dircache_indices(self) -> List[Optional[int]]:
+        """
+        Returns the dircache index of every entry, in entry order, or None for
+        entries without FLAG_DIRCACHE set. Equivalent to calling get_dircache_idx
+        on each entry, but reads the flag values in a single pass.
+        """
+        return [
+            (flag >> 16) & 0x0000FFFF if flag & FLAG_DIRCACHE else None
+            for flag in self.flag_column()
+        ]
+
     @property
     def loaded_tag_files(self) -> Dict[int, TagFile]:
         """Returns the dictionary of loaded TagFile objects."""
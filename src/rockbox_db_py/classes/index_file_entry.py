@@ -3,12 +3,12 @@
 # Represents a single entry in the master index file (database_idx.tcd).
 # Each entry links a specific audio track to its various tag values.
 
+import array
 import struct
-from typing import Dict, Optional, List, Union
+from typing import Any, Callable, Dict, Mapping, Optional, List, Tuple, Union
 
 from rockbox_db_py.classes.tag_file import TagFile
 from rockbox_db_py.classes.tag_file_entry import TagFileEntry
-from rockbox_db_py.classes.db_file_type import RockboxDBFileType
 from rockbox_db_py.utils.defs import (
     TagTypeEnum,
     TAG_COUNT,
@@ -19,9 +19,115 @@ from rockbox_db_py.utils.defs import (
     FLAG_TRKNUMGEN,
     FLAG_RESURRECTED,
 )
-from rockbox_db_py.utils.struct_helpers import (
-    read_uint32,
-    ENDIANNESS_CHAR,
+from rockbox_db_py.utils.struct_helpers import NEEDS_BYTESWAP, ENDIANNESS_CHAR
+
+# On-disk size of a single entry: TAG_COUNT tag_seek values plus the flag, all uint32.
+INDEX_ENTRY_SIZE = (TAG_COUNT + 1) * 4
+
+# Precompiled layout of a single entry, so packing doesn't re-parse the format each time.
+_ENTRY_STRUCT = struct.Struct(f"{ENDIANNESS_CHAR}{TAG_COUNT + 1}I")
+
+# Shared stand-in for entries not (yet) linked to an IndexFile's TagFiles, so that
+# unlinked entries don't each allocate their own empty dict. Never mutated.
+_NO_TAG_FILES: Dict[int, TagFile] = {}
+
+# Set form of FILE_TAG_INDICES for O(1) membership checks.
+_FILE_TAG_INDICES: frozenset = frozenset(FILE_TAG_INDICES)
+
+# Human-readable names for each entry flag, in the order they are reported.
+_FLAG_NAMES = (
+    (FLAG_DELETED, "DELETED"),
+    (FLAG_DIRCACHE, "DIRCACHE"),
+    (FLAG_DIRTYNUM, "DIRTYNUM"),
+    (FLAG_TRKNUMGEN, "TRKNUMGEN"),
+    (FLAG_RESURRECTED, "RESURRECTED"),
+)
+
+# Mask covering every named flag bit (the higher bits hold the dircache index).
+_FLAG_NAMES_MASK = (
+    FLAG_DELETED | FLAG_DIRCACHE | FLAG_DIRTYNUM | FLAG_TRKNUMGEN | FLAG_RESURRECTED
+)
+
+# Flag names for every possible combination of the named flag bits.
+_FLAG_NAMES_BY_VALUE = tuple(
+    tuple(name for mask, name in _FLAG_NAMES if value & mask)
+    for value in range(_FLAG_NAMES_MASK + 1)
+)
+
+
+def decode_entry_table(data: bytes) -> Union[memoryview, array.array]:
+    """
+    Exposes a contiguous block of raw index entries as a flat sequence of uint32 values.
+    Each entry occupies TAG_COUNT + 1 consecutive values: its tag_seek list, then its flag.
+
+    When the on-disk byte order matches the native one this is a zero-copy view over
+    data (which must then stay alive while the view is used), otherwise it is a
+    byteswapped copy.
+    """
+    if len(data) % INDEX_ENTRY_SIZE != 0:
+        raise ValueError(
+            f"Index entry data length {len(data)} is not a multiple of {INDEX_ENTRY_SIZE}."
+        )
+
+    if not NEEDS_BYTESWAP:
+        return memoryview(data).cast("I")
+
+    values: array.array = array.array("I", data)
+    values.byteswap()
+    return values
+
+
+# Resolves a raw tag_seek value, given the TagFiles loaded for its IndexFile.
+_TagResolver = Callable[[Any, Mapping[int, TagFile]], Union[str, int, None]]
+
+
+def _resolve_numeric_tag(
+    seek_value: int, loaded_tag_files: Mapping[int, TagFile]
+) -> Optional[int]:
+    """Resolves an embedded numeric tag, which is stored directly in tag_seek."""
+    # 0 is common for undefined numeric tags.
+    if seek_value == 0:
+        return None
+    return seek_value
+
+
+def _make_file_tag_resolver(tag_index: int) -> _TagResolver:
+    """Builds the resolver for a file-based tag, with its tag index bound in."""
+
+    def resolve(
+        seek_value: Union[int, TagFileEntry], loaded_tag_files: Mapping[int, TagFile]
+    ) -> Optional[str]:
+        # If seek_value is a TagFileEntry object (used during modification phase), return its data directly.
+        if isinstance(seek_value, TagFileEntry):
+            return seek_value.tag_data
+
+        # 0xFFFFFFFF is the sentinel for no data for string tags.
+        if seek_value == 0xFFFFFFFF:
+            return None
+
+        # Attempt to resolve the offset to an entry in the corresponding TagFile.
+        # Loaded TagFiles are keyed by their tag index, so no file type lookup is needed.
+        tag_file_obj: Optional[TagFile] = loaded_tag_files.get(tag_index)
+        if tag_file_obj is not None:
+            tag_file_entry: Optional[TagFileEntry] = tag_file_obj.get_entry_by_offset(
+                seek_value
+            )
+            if tag_file_entry:
+                return tag_file_entry.tag_data
+
+        # TagFile not loaded or entry not found at offset.
+        return None
+
+    return resolve
+
+
+# The resolver for each tag index, so a lookup dispatches straight to the right
+# logic for its tag kind rather than re-checking it on every access.
+_TAG_RESOLVERS: Tuple[_TagResolver, ...] = tuple(
+    _make_file_tag_resolver(tag_index)
+    if tag_index in _FILE_TAG_INDICES
+    else _resolve_numeric_tag
+    for tag_index in range(TAG_COUNT)
 )
 
 
@@ -34,6 +140,9 @@ class IndexFileEntry:
     For embedded numeric tags (e.g., year, bitrate), it stores the value directly.
     """
 
+    # A database can hold tens of thousands of entries, so avoid a per-instance __dict__.
+    __slots__ = ("tag_seek", "flag", "_loaded_tag_files")
+
     def __init__(
         self, tag_seek: Optional[List[Union[int, TagFileEntry]]] = None, flag: int = 0
     ):
@@ -46,8 +155,9 @@ class IndexFileEntry:
         # Status flags for the entry (e.g., DELETED, DIRTYNUM).
         self.flag: int = flag
 
-        # Reference to loaded TagFile objects for resolving string tags.
-        self._loaded_tag_files: Dict[int, TagFile] = {}
+        # Reference to the owning IndexFile's loaded TagFile objects for resolving string tags.
+        # This is shared between all entries of an IndexFile, and set by IndexFile.add_entry.
+        self._loaded_tag_files: Mapping[int, TagFile] = _NO_TAG_FILES
 
     @classmethod
     def from_file(cls, f, loaded_tag_files: Optional[Dict[int, TagFile]] = None):
@@ -61,17 +171,93 @@ class IndexFileEntry:
         Returns:
             A new IndexFileEntry instance.
         """
-        tag_seeks: List[int] = []
-        # Read TAG_COUNT 4-byte integers for tag_seek values.
-        for _ in range(TAG_COUNT):
-            tag_seeks.append(read_uint32(f))
+        return cls.from_file_bulk(f, 1, loaded_tag_files=loaded_tag_files)[0]
+
+    @classmethod
+    def from_file_bulk(
+        cls, f, count: int, loaded_tag_files: Optional[Dict[int, TagFile]] = None
+    ) -> List["IndexFileEntry"]:
+        """
+        Reads a run of consecutive IndexFileEntry objects from a file object,
+        with a single read call.
+
+        Args:
+            f: File object, positioned at the start of the first entry.
+            count: Number of entries to read.
+            loaded_tag_files: Dictionary of loaded TagFile objects for resolving string tags.
+
+        Returns:
+            A list of new IndexFileEntry instances, in file order.
+        """
+        # Read TAG_COUNT 4-byte tag_seek values and the 4-byte flag for every entry in one go.
+        data_size: int = count * INDEX_ENTRY_SIZE
+        data: bytes = f.read(data_size)
+        if len(data) != data_size:
+            raise ValueError(f"Not enough data to read {count} index file entries.")
 
-        # Read the 4-byte flag.
-        flag: int = read_uint32(f)
+        return cls.list_from_bytes(data, loaded_tag_files=loaded_tag_files)
 
-        instance = cls(tag_seek=tag_seeks, flag=flag)
-        if loaded_tag_files is not None:
+    @classmethod
+    def list_from_bytes(
+        cls, data: bytes, loaded_tag_files: Optional[Dict[int, TagFile]] = None
+    ) -> List["IndexFileEntry"]:
+        """
+        Decodes a contiguous block of raw entries, as stored after the index header.
+
+        Each entry is unpacked in C by a single precompiled Struct, rather than
+        reading each 4-byte field of each entry separately.
+
+        Args:
+            data: Raw bytes holding a whole number of entries.
+            loaded_tag_files: Dictionary of loaded TagFile objects for resolving string tags.
+
+        Returns:
+            A list of new IndexFileEntry instances, in file order.
+        """
+        if len(data) % INDEX_ENTRY_SIZE != 0:
+            raise ValueError(
+                f"Index entry data length {len(data)} is not a multiple of {INDEX_ENTRY_SIZE}."
+            )
+
+        if loaded_tag_files is None:
+            loaded_tag_files = _NO_TAG_FILES
+
+        entries: List["IndexFileEntry"] = []
+        for values in _ENTRY_STRUCT.iter_unpack(data):
+            instance = cls.__new__(cls)
+            instance.tag_seek = list(values[:TAG_COUNT])
+            instance.flag = values[TAG_COUNT]
             instance._loaded_tag_files = loaded_tag_files
+            entries.append(instance)
+        return entries
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer,
+        offset: int = 0,
+        loaded_tag_files: Optional[Dict[int, TagFile]] = None,
+    ) -> "IndexFileEntry":
+        """
+        Builds an IndexFileEntry from raw entry bytes held in a buffer, without copying them.
+
+        Args:
+            buffer: Any bytes-like object holding raw entries (e.g. the index file's entry block).
+            offset: Byte offset of the entry within the buffer.
+            loaded_tag_files: Dictionary of loaded TagFile objects for resolving string tags.
+
+        Returns:
+            A new IndexFileEntry instance.
+        """
+        values = _ENTRY_STRUCT.unpack_from(buffer, offset)
+
+        # Fill the slots directly, skipping __init__ and its default-value handling.
+        instance = cls.__new__(cls)
+        instance.tag_seek = list(values[:TAG_COUNT])
+        instance.flag = values[TAG_COUNT]
+        instance._loaded_tag_files = (
+            loaded_tag_files if loaded_tag_files is not None else _NO_TAG_FILES
+        )
         return instance
 
     def to_bytes(self) -> bytes:
@@ -79,21 +265,34 @@ class IndexFileEntry:
         Converts the IndexFileEntry object to its raw byte representation for disk.
         Ensures all tag_seek values are numerical offsets/values before packing.
         """
-        packed_data: bytes = b""
-        # Pack each tag_seek value.
-        for seek_val in self.tag_seek:
-            # tag_seek should contain only integers (offsets or raw values) at this point.
-            if not isinstance(seek_val, int):
-                raise ValueError(
-                    f"Tag seek value is not an integer: {seek_val}. "
-                    "Ensure finalize_index_for_write is called before to_bytes."
-                )
-            packed_data += struct.pack(ENDIANNESS_CHAR + "I", seek_val)
-
-        # Pack the flag.
-        packed_data += struct.pack(ENDIANNESS_CHAR + "I", self.flag)
+        # Pack every tag_seek value, followed by the flag, in a single call.
+        # tag_seek should contain only integers (offsets or raw values) at this point,
+        # which the packing checks for us.
+        try:
+            return _ENTRY_STRUCT.pack(*self.tag_seek, self.flag)
+        except struct.error:
+            self._raise_if_unresolved()
+            raise
 
-        return packed_data
+    def pack_into(self, buffer: bytearray, offset: int) -> None:
+        """
+        Packs the raw byte representation of this entry directly into a writable buffer,
+        at the given byte offset. See to_bytes.
+        """
+        try:
+            _ENTRY_STRUCT.pack_into(buffer, offset, *self.tag_seek, self.flag)
+        except struct.error:
+            self._raise_if_unresolved()
+            raise
+
+    def _raise_if_unresolved(self) -> None:
+        """Raises a ValueError if any tag_seek value is not yet a numerical offset/value."""
+        seek_val = next((v for v in self.tag_seek if not isinstance(v, int)), None)
+        if seek_val is not None:
+            raise ValueError(
+                f"Tag seek value is not an integer: {seek_val}. "
+                "Ensure finalize_index_for_write is called before to_bytes."
+            )
 
     @property
     def size(self) -> int:
@@ -101,34 +300,29 @@ class IndexFileEntry:
         Returns the total byte size of this IndexFileEntry on disk.
         Calculated as (TAG_COUNT * 4 bytes for tag_seek) + (4 bytes for flag).
         """
-        return TAG_COUNT * 4 + 4
+        return INDEX_ENTRY_SIZE
 
     def get_flag_names(self) -> List[str]:
         """Returns a list of human-readable names for flags set on this entry."""
-        names: List[str] = []
-        if self.flag & FLAG_DELETED:
-            names.append("DELETED")
-        if self.flag & FLAG_DIRCACHE:
-            names.append("DIRCACHE")
-        if self.flag & FLAG_DIRTYNUM:
-            names.append("DIRTYNUM")
-        if self.flag & FLAG_TRKNUMGEN:
-            names.append("TRKNUMGEN")
-        if self.flag & FLAG_RESURRECTED:
-            names.append("RESURRECTED")
-        return names
+        return list(_FLAG_NAMES_BY_VALUE[self.flag & _FLAG_NAMES_MASK])
 
     def get_dircache_idx(self) -> Optional[int]:
         """Extracts the dircache index from the higher 16 bits of the flag."""
         return (self.flag >> 16) & 0x0000FFFF if (self.flag & FLAG_DIRCACHE) else None
 
-    def get_parsed_tag_value(self, tag_enum: TagTypeEnum) -> Union[str, int, None]:
+    def get_parsed_tag_value(
+        self,
+        tag_enum: TagTypeEnum,
+        loaded_tag_files: Optional[Mapping[int, TagFile]] = None,
+    ) -> Union[str, int, None]:
         """
         Retrieves the actual parsed value for a given tag type.
         Handles resolving file-based string tags (via offset lookup) and embedded numeric tags.
 
         Args:
             tag_enum: The TagTypeEnum member representing the desired tag.
+            loaded_tag_files: Optional TagFiles to resolve string tags against.
+                              Defaults to the TagFiles this entry is linked to.
 
         Returns:
             The resolved string, integer value, or None if not found/defined.
@@ -143,64 +337,40 @@ class IndexFileEntry:
                 f"Tag index {tag_index} out of range. Must be between 0 and {TAG_COUNT - 1}."
             )
 
-        seek_value: Union[int, TagFileEntry] = self.tag_seek[tag_index]
-
-        # If seek_value is a TagFileEntry object (used during modification phase), return its data directly.
-        if isinstance(seek_value, TagFileEntry):
-            return seek_value.tag_data
-
-        # For file-based tags, resolve the integer offset to a string.
-        if tag_index in FILE_TAG_INDICES:
-            # 0xFFFFFFFF is the sentinel for no data for string tags.
-            if seek_value == 0xFFFFFFFF:
-                return None
-
-            # Attempt to resolve the offset to an entry in the corresponding TagFile.
-            tag_file_type: Optional[RockboxDBFileType] = None
-            try:
-                tag_file_type = RockboxDBFileType.from_tag_index(tag_index)
-            except ValueError:
-                # Should not happen if FILE_TAG_INDICES and RockboxDBFileType are in sync.
-                pass
-
-            if tag_file_type and tag_file_type.tag_index in self._loaded_tag_files:
-                tag_file_obj: "TagFile" = self._loaded_tag_files[
-                    tag_file_type.tag_index
-                ]
-                tag_file_entry: Optional[TagFileEntry] = (
-                    tag_file_obj.get_entry_by_offset(seek_value)
-                )
-                if tag_file_entry:
-                    return tag_file_entry.tag_data
-
-            # TagFile not loaded or entry not found at offset.
-            return None
+        return self._get_parsed_by_index(tag_index, loaded_tag_files)
 
-        else:
-            # 0 is common for undefined numeric tags.
-            if seek_value == 0:
-                return None
-            return seek_value
-
-    def __getattr__(self, name: str) -> Union[str, int, List[int], None]:
+    def _get_parsed_by_index(
+        self,
+        tag_index: int,
+        loaded_tag_files: Optional[Mapping[int, TagFile]] = None,
+    ) -> Union[str, int, None]:
         """
-        Enables attribute-like access (e.g., entry.artist) for tag values.
-        It calls get_parsed_tag_value internally.
+        Resolves a tag value by its (already validated) tag index.
+        See get_parsed_tag_value.
         """
-        # Allow direct access to standard instance properties.
-        if name in ["tag_seek", "flag", "_loaded_tag_files", "size"]:
-            return object.__getattribute__(self, name)
-
-        # Convert the attribute name to a TagTypeEnum member for lookup.
-        try:
-            tag_enum: TagTypeEnum = TagTypeEnum[name]
-        except KeyError:
-            raise AttributeError(
-                f"'{type(self).__name__}' object has no attribute '{name}' (not a recognized tag)."
-            )
-
-        return self.get_parsed_tag_value(tag_enum)
+        if loaded_tag_files is None:
+            loaded_tag_files = self._loaded_tag_files
+        return _TAG_RESOLVERS[tag_index](self.tag_seek[tag_index], loaded_tag_files)
 
     def __repr__(self) -> str:
         """Provides a developer-friendly string representation."""
         return f"IndexFileEntry(flag={hex(self.flag)}, flags={self.get_flag_names()})"
+
+
+def _make_tag_property(tag_enum: TagTypeEnum) -> property:
+    """Builds the read-only attribute for a tag (e.g. entry.artist)."""
+    tag_index: int = tag_enum.value
+    resolve: _TagResolver = _TAG_RESOLVERS[tag_index]
+
+    def get_tag(self: IndexFileEntry) -> Union[str, int, None]:
+        return resolve(self.tag_seek[tag_index], self._loaded_tag_files)
+
+    return property(get_tag, doc=f"The parsed {tag_enum.name} tag value.")
+
+
+# Enables attribute-like access (e.g., entry.artist) for tag values, equivalent to
+# get_parsed_tag_value. Real properties resolve through normal attribute lookup,
+# rather than through a __getattr__ fallback after a failed lookup.
+for _tag_enum in TagTypeEnum:
+    setattr(IndexFileEntry, _tag_enum.name, _make_tag_property(_tag_enum))
+del _tag_enum
@@ -4,11 +4,13 @@
 # size, modification time, and all parsed metadata tags as raw Python types.
 # This class is designed to be fully picklable for multiprocessing.
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+import hashlib
+import operator
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 
-from rockbox_db_py.utils.utils import mtime_to_fat
+from rockbox_db_py.utils.utils import get_file_extension, mtime_to_fat
 
 from mediafile import MediaFile, TYPES
 
@@ -47,7 +49,80 @@ ROCKBOX_TO_MEDIAFILE = [
     TagType("length", ["length"], "float"),
 ]
 
+# Converters for each TagType.type. A type without a converter keeps the raw value.
+_TAG_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+}
 
+
+def _make_tag_extractor(tag_props: TagType) -> Callable[[MediaFile], Any]:
+    """
+    Builds a function reading one Rockbox tag from a MediaFile: the first of its
+    MediaFile attributes that is set, converted to the tag's type (or None if unset).
+    """
+    mediafile_names: Tuple[str, ...] = tuple(tag_props.mediafile_names)
+    converter: Optional[Callable[[Any], Any]] = _TAG_CONVERTERS.get(tag_props.type)
+
+    if len(mediafile_names) == 1:
+        (mediafile_name,) = mediafile_names
+
+        def read_value(media_file: MediaFile) -> Any:
+            return getattr(media_file, mediafile_name, None)
+
+    else:
+
+        def read_value(media_file: MediaFile) -> Any:
+            for mediafile_name in mediafile_names:
+                tag_value = getattr(media_file, mediafile_name, None)
+                if tag_value is not None:
+                    return tag_value
+            return None
+
+    if converter is None:
+        return read_value
+
+    def extract(media_file: MediaFile) -> Any:
+        tag_value = read_value(media_file)
+        if not tag_value:
+            return None
+        # MediaFile usually returns the right type already, so skip the conversion then.
+        if type(tag_value) is converter:
+            return tag_value
+
+        # A value that can't be converted is treated as unset, rather than failing
+        # the whole file.
+        try:
+            return converter(tag_value)
+        except (ValueError, TypeError):
+            return None
+
+    return extract
+
+
+# Precomputed form of ROCKBOX_TO_MEDIAFILE, used when reading every file:
+# (rockbox_name, extractor), so no per-file work is spent interpreting the mapping.
+_TAG_EXTRACTORS: Tuple[Tuple[str, Callable[[MediaFile], Any]], ...] = tuple(
+    (tag_props.rockbox_name, _make_tag_extractor(tag_props))
+    for tag_props in ROCKBOX_TO_MEDIAFILE
+)
+
+# Tags whose values typically repeat across many tracks (e.g. every track of an album),
+# which MusicFile.share_tag_strings deduplicates.
+_SHARED_TAG_FIELDS: Tuple[str, ...] = (
+    "artist",
+    "album",
+    "genre",
+    "composer",
+    "comment",
+    "albumartist",
+    "date",
+    "canonicalartist",
+)
+
+
+@dataclass(slots=True, eq=False)
 class MusicFile:
     """
     Represents an audio file on the PC filesystem, encapsulating its path,
@@ -55,57 +130,51 @@ class MusicFile:
     This class is designed to be fully picklable for multiprocessing.
     """
 
-    def __init__(
-        self,
-        filepath: str,
-        filesize: int,
-        modtime_unix: int,
-        title: Optional[str] = None,
-        artist: Optional[str] = None,
-        album: Optional[str] = None,
-        genre: Optional[str] = None,
-        composer: Optional[str] = None,
-        comment: Optional[str] = None,
-        albumartist: Optional[str] = None,
-        grouping: Optional[str] = None,
-        date: Optional[str] = None,
-        year: Optional[int] = None,
-        discnumber: Optional[int] = None,
-        tracknumber: Optional[int] = None,
-        bitrate: Optional[int] = None,
-        length: Optional[float] = None,
-    ):
-        self.filepath: str = filepath
-        self.filesize: int = filesize
-        self.modtime_unix: int = modtime_unix
-        self.modtime_fat32: int = mtime_to_fat(modtime_unix)
-
-        self.title: Optional[str] = title
-        self.artist: Optional[str] = artist
-        self.album: Optional[str] = album
-        self.genre: Optional[str] = genre
-        self.composer: Optional[str] = composer
-        self.comment: Optional[str] = comment
-        self.albumartist: Optional[str] = albumartist
-        self.grouping: Optional[str] = grouping
-        self.date: Optional[str] = date
-        self.year: Optional[int] = year
-        self.discnumber: Optional[int] = discnumber
-        self.tracknumber: Optional[int] = tracknumber
-        self.bitrate: Optional[int] = (
-            int(bitrate / 1000) if bitrate is not None else None
-        )
-        self.length: Optional[int] = (
-            int(length * 1000.0) if length is not None else None
-        )
+    filepath: str
+    filesize: int
+    modtime_unix: int
 
-        # Get some useful derived properties
-        self.file_extension: str = os.path.splitext(filepath)[1].lower()
+    title: Optional[str] = None
+    artist: Optional[str] = None
+    album: Optional[str] = None
+    genre: Optional[str] = None
+    composer: Optional[str] = None
+    comment: Optional[str] = None
+    albumartist: Optional[str] = None
+    grouping: Optional[str] = None
+    date: Optional[str] = None
+    year: Optional[int] = None
+    discnumber: Optional[int] = None
+    tracknumber: Optional[int] = None
+    # Passed in as bits/s and seconds, stored as kbps and milliseconds.
+    bitrate: Optional[int] = None
+    length: Optional[int] = None
+
+    # Derived in __post_init__.
+    modtime_fat32: int = field(init=False)
+    canonicalartist: Optional[str] = field(init=False)
+
+    def __post_init__(self):
+        self.modtime_fat32 = mtime_to_fat(self.modtime_unix)
 
+        if self.bitrate is not None:
+            self.bitrate = int(self.bitrate / 1000)
+        if self.length is not None:
+            self.length = int(self.length * 1000.0)
+
+        # Get some useful derived properties
         self.grouping = self.title if self.grouping is None else self.grouping
         self.canonicalartist = self.artist if self.artist else self.albumartist
         self.composer = self.composer if self.composer else "<Untagged>"
 
+    @property
+    def file_extension(self) -> str:
+        """
+        The lowercased file extension, including the dot (e.g. ".mp3").
+        Derived from the path on access, as the database build never needs it.
+        """
+        return get_file_extension(self.filepath)
+
     @property
     def filename(self) -> str:
         """
@@ -119,13 +188,21 @@ class MusicFile:
         return self.filepath
 
     @classmethod
-    def from_filepath(cls, path: str) -> Optional["MusicFile"]:
+    def from_filepath(
+        cls, path: str, stat_info: Optional[os.stat_result] = None
+    ) -> Optional["MusicFile"]:
         """
         Creates a MusicFile instance by reading file system info and audio tags.
         Metadata is extracted and stored as raw Python types.
+
+        Args:
+            path: Path to the audio file.
+            stat_info: The file's os.stat result, if already known (e.g. from a
+                       directory scan). If None, the file is stat'ed here.
         """
         try:
-            stat_info = os.stat(path)
+            if stat_info is None:
+                stat_info = os.stat(path)
             filesize: int = stat_info.st_size
             modtime_unix: int = int(stat_info.st_mtime)
 
@@ -135,29 +212,10 @@ class MusicFile:
                 print(f"Unsupported file format or no tags found for: {path}")
                 return None
 
-            extracted_tags: Dict[str, Any] = {}
-            for tag_props in ROCKBOX_TO_MEDIAFILE:
-                rockbox_name = tag_props.rockbox_name
-                mediafile_tags = tag_props.mediafile_names
-                tag_type = tag_props.type
-
-                # Use getattr to get the tag value, defaulting to None if not present
-                for mediafile_tag in mediafile_tags:
-                    tag_value = getattr(media_file, mediafile_tag, None)
-                    if tag_value is not None:
-                        break
-
-                # Convert the tag value to the appropriate type
-                if tag_type == "str":
-                    extracted_tags[rockbox_name] = str(tag_value) if tag_value else None
-                elif tag_type == "int":
-                    extracted_tags[rockbox_name] = int(tag_value) if tag_value else None
-                elif tag_type == "float":
-                    extracted_tags[rockbox_name] = (
-                        float(tag_value) if tag_value else None
-                    )
-                else:
-                    extracted_tags[rockbox_name] = tag_value
+            extracted_tags: Dict[str, Any] = {
+                rockbox_name: extract(media_file)
+                for rockbox_name, extract in _TAG_EXTRACTORS
+            }
 
             # If the comment tag is not found, set a default value.
             # TODO: How on earth does RockBox generate this? It seems to be vary, but no idea.
@@ -215,9 +273,97 @@ class MusicFile:
         artist_val = self.artist if self.artist is not None else "(No Artist)"
         return f"MusicFile(filepath='{self.filepath}', title='{title_val}', artist='{artist_val}')"
 
-    def generate_unique_id(self) -> str:
+    def to_row(self) -> Tuple[Any, ...]:
+        """
+        Returns the value of every field as a plain tuple, in field order (see
+        from_row). Tuples are much cheaper to pickle than MusicFile objects, so this
+        is how parsed files are sent back from worker processes.
+        """
+        return _get_row(self)
+
+    @classmethod
+    def from_row(cls, row: Tuple[Any, ...]) -> "MusicFile":
+        """
+        Rebuilds a MusicFile from a tuple made by to_row. The derived fields are
+        restored as they were, rather than being computed again.
+        """
+        music_file: MusicFile = cls.__new__(cls)
+        music_file.__setstate__(row)
+        return music_file
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        """Pickles as a positional tuple of field values (see to_row)."""
+        return _get_row(self)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        """Restores the field values from a __getstate__ tuple."""
+        if len(state) != len(_ROW_SETTERS):
+            raise ValueError(
+                f"Expected {len(_ROW_SETTERS)} MusicFile field values, got {len(state)}."
+            )
+        for set_field, value in zip(_ROW_SETTERS, state):
+            set_field(self, value)
+
+    def share_tag_strings(self, string_cache: Dict[str, str]) -> None:
+        """
+        Replaces repeated tag strings (artist, album, genre, ...) with the equal string
+        already held in string_cache, adding any new ones. Sharing one cache across a
+        whole library means tracks with the same value reference a single string object,
+        rather than each holding its own copy (as they do after being parsed in, and
+        pickled back from, a worker process, where from_filepath's interning is lost).
+
+        A plain dict is used, rather than sys.intern, so the strings are freed along
+        with the cache and the tracks.
+        """
+        for field_name in _SHARED_TAG_FIELDS:
+            value: Optional[str] = getattr(self, field_name)
+            if value is not None:
+                setattr(self, field_name, string_cache.setdefault(value, value))
+
+    def generate_unique_id(self) -> bytes:
         """
         Generates a unique ID for this music file based on its filepath and modification time.
         This is used for de-duplication and tracking in the database.
+
+        The ID is a fixed-size 128-bit BLAKE2b digest rather than the (potentially long)
+        path string, so it is cheap to hash and store as a dict key.
         """
-        return f"{self.filepath}_{self.modtime_unix}"
+        return hashlib.blake2b(
+            self.filepath.encode("utf-8", "surrogateescape")
+            + self.modtime_unix.to_bytes(8, "little", signed=True),
+            digest_size=16,
+        ).digest()
+
+
+# Field order of MusicFile.to_row, with accessors for building and restoring rows.
+_ROW_FIELDS: Tuple[str, ...] = tuple(member.name for member in fields(MusicFile))
+_get_row: Callable[[MusicFile], Tuple[Any, ...]] = operator.attrgetter(*_ROW_FIELDS)
+_ROW_SETTERS: Tuple[Callable[[MusicFile, Any], None], ...] = tuple(
+    getattr(MusicFile, name).__set__ for name in _ROW_FIELDS
+)
+
+
+def parse_music_file_chunk(
+    files: List[Tuple[str, Optional[os.stat_result]]],
+) -> Tuple[int, List[Tuple[Any, ...]]]:
+    """
+    Parses a chunk of audio files, for use as a worker process task.
+
+    Args:
+        files: (path, stat result or None) pairs, as for MusicFile.from_filepath.
+
+    Returns:
+        The number of files processed, and a MusicFile.to_row tuple for each file that
+        was parsed successfully. The whole chunk is returned as one batch of tuples,
+        which is far cheaper to send between processes than one MusicFile at a time.
+    """
+    # Share repeated tag strings within the chunk, so each distinct value is only
+    # pickled once when the rows are sent back.
+    string_cache: Dict[str, str] = {}
+    rows: List[Tuple[Any, ...]] = []
+    for path, stat_info in files:
+        music_file: Optional[MusicFile] = MusicFile.from_filepath(path, stat_info)
+        if music_file is not None:
+            music_file.share_tag_strings(string_cache)
+            rows.append(music_file.to_row())
+    return len(files), rows
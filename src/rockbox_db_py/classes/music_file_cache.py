@@ -0,0 +1,98 @@
+# music_file_cache.py
+#
+# A persistent, on-disk cache of parsed MusicFile objects.
+# Each entry is keyed by the file's path, size and modification time, so files
+# that haven't changed since the last scan can be reused without re-reading
+# their tags.
+
+import os
+import pickle
+import sqlite3
+from typing import Iterable, Optional
+
+from rockbox_db_py.classes.music_file import MusicFile
+
+# Bump this whenever MusicFile's fields change, so old pickles are discarded
+# rather than being loaded into an incompatible object.
+CACHE_VERSION = 4
+
+
+class MusicFileCache:
+    """
+    Stores parsed MusicFile objects in an SQLite database, keyed by
+    (filepath, filesize, modtime_unix). A lookup only hits if the file on disk
+    still has the size and modification time it was parsed with.
+
+    Entries for files that no longer exist are never looked up, but are not
+    removed either; delete the cache file to reset it.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path: str = cache_path
+        self._connection: sqlite3.Connection = sqlite3.connect(cache_path)
+
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        # Discard caches written by a different version of MusicFile.
+        (user_version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if user_version != CACHE_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS music_files")
+            self._connection.execute(f"PRAGMA user_version={CACHE_VERSION}")
+
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS music_files ("
+            "filepath TEXT PRIMARY KEY, filesize INTEGER, modtime_unix INTEGER, "
+            "data BLOB)"
+        )
+        self._connection.commit()
+
+    def get(self, path: str, stat_info: os.stat_result) -> Optional[MusicFile]:
+        """
+        Returns the cached MusicFile for path, if the cached copy was parsed from a
+        file with the same size and modification time as stat_info. Otherwise None.
+        """
+        row = self._connection.execute(
+            "SELECT data FROM music_files "
+            "WHERE filepath = ? AND filesize = ? AND modtime_unix = ?",
+            (path, stat_info.st_size, int(stat_info.st_mtime)),
+        ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            # A corrupt entry is treated as a miss, and replaced on the next add.
+            return None
+
+    def add_many(self, music_files: Iterable[MusicFile]) -> None:
+        """Adds (or replaces) the cache entries for the given MusicFile objects."""
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO music_files "
+            "(filepath, filesize, modtime_unix, data) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    music_file.filepath,
+                    music_file.filesize,
+                    music_file.modtime_unix,
+                    pickle.dumps(music_file, protocol=pickle.HIGHEST_PROTOCOL),
+                )
+                for music_file in music_files
+            ),
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        self._connection.close()
+
+    def __enter__(self) -> "MusicFileCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        """Provides a developer-friendly string representation."""
+        return f"MusicFileCache(cache_path='{self.cache_path}')"
@@ -7,12 +7,23 @@
 # managing their header, and the list of TagFileEntry objects they contain.
 
 import os
-from typing import Optional, List, Dict
+import struct
+from functools import cached_property
+from itertools import accumulate
+from typing import Optional, List, Dict, Iterable, Iterator, Union
 
-from rockbox_db_py.utils.defs import TAG_TYPES
+from rockbox_db_py.utils.defs import ENCODING, TAG_TYPES
 from rockbox_db_py.classes.db_file_type import RockboxDBFileType
-from rockbox_db_py.utils.struct_helpers import read_uint32, write_uint32
-from rockbox_db_py.classes.tag_file_entry import TagFileEntry
+from rockbox_db_py.utils.struct_helpers import ENDIANNESS_CHAR
+from rockbox_db_py.classes.tag_file_entry import (
+    TagFileEntry,
+    TAG_FILE_ENTRY_HEADER_SIZE,
+    padded_tag_length,
+)
+
+# Size of a Tag File header: magic, datasize and entry_count.
+TAG_FILE_HEADER_SIZE = 3 * 4
+_HEADER_STRUCT = struct.Struct(f"{ENDIANNESS_CHAR}3I")
 
 
 class TagFile:
@@ -39,18 +50,26 @@ class TagFile:
         self.entry_count: int = 0
         # List of all TagFileEntry objects.
         self.entries: List[TagFileEntry] = []
-        # Map offsets to TagFileEntry objects for quick lookup by byte offset.
-        self.entries_by_offset: Dict[int, TagFileEntry] = {}
+        # Entries in the order they were last read from or written to disk, from
+        # which entries_by_offset is built on first use.
+        self._entries_on_disk: List[TagFileEntry] = []
         # Map case-folded tag data strings to their canonical (unique) TagFileEntry object.
         self.entries_by_tag_data: Dict[str, TagFileEntry] = {}
 
     @classmethod
-    def from_file(cls, filepath: str) -> "TagFile":
+    def from_file(
+        cls,
+        filepath: str,
+        string_cache: Optional[Dict[str, str]] = None,
+    ) -> "TagFile":
         """
         Reads a TagFile from a specified file path, populating its entries and lookups.
 
         Args:
             filepath: Path to the .tcd file.
+            string_cache: Optional dict used to share equal decoded strings, e.g.
+                          between the Tag Files of one database. A new one is used
+                          for just this file if not given.
 
         Returns:
             A new TagFile instance.
@@ -67,38 +86,56 @@ class TagFile:
 
         tag_file: "TagFile" = cls(db_file_type=db_file_type)
 
+        # Read the whole file at once, and parse the entries from memory.
         with open(filepath, "rb") as f:
-            # Read TagFile header.
-            magic_read: int = read_uint32(f)
-            datasize_read: int = read_uint32(f)
-            entry_count_read: int = read_uint32(f)
-
-            if magic_read != tag_file.magic:
-                raise ValueError(
-                    f"Invalid magic number in {filepath}. Expected {hex(tag_file.magic)}, got {hex(magic_read)}"
-                )
-
-            tag_file.magic = magic_read
-            tag_file.datasize = datasize_read
-            tag_file.entry_count = entry_count_read
-
-            # This ensures `tag_file.entries` matches the exact `entry_count` from the header.
-            # Deduplication for functional purposes will happen in `add_entry` or during processing.
-            for _ in range(tag_file.entry_count):
-                entry: TagFileEntry = TagFileEntry.from_file(
-                    f, db_file_type=db_file_type
-                )
-
-                tag_file.add_entry(entry)
-
-                # Store entry in entries_by_offset by its original offset.
-                # This map needs to contain ALL entries read from the file.
-                if entry.offset_in_file is not None:
-                    tag_file.entries_by_offset[entry.offset_in_file] = entry
-
-                # Store entry in entries_by_tag_data as canonical lookup.
-                key = entry.key if duplicates_possible else entry.tag_data
-                tag_file.entries_by_tag_data[key] = entry
+            data: bytes = f.read()
+
+        # Read TagFile header.
+        if len(data) < TAG_FILE_HEADER_SIZE:
+            raise ValueError("Not enough data to read a 32-bit unsigned integer.")
+        magic_read, datasize_read, entry_count_read = _HEADER_STRUCT.unpack_from(data)
+
+        if magic_read != tag_file.magic:
+            raise ValueError(
+                f"Invalid magic number in {filepath}. Expected {hex(tag_file.magic)}, got {hex(magic_read)}"
+            )
+
+        tag_file.magic = magic_read
+        tag_file.datasize = datasize_read
+        tag_file.entry_count = entry_count_read
+
+        # Tag values repeat (e.g. titles shared by several tracks, or an artist that is
+        # also an album artist), so equal values share one string object. A dict
+        # scoped to this load is used, rather than sys.intern, so the strings are
+        # freed along with the TagFiles. File paths are unique, so are left alone.
+        if db_file_type.is_filename_db:
+            string_cache = None
+        elif string_cache is None:
+            string_cache = {}
+
+        # This ensures `tag_file.entries` matches the exact `entry_count` from the header.
+        # Deduplication for functional purposes will happen in `add_entry` or during processing.
+        offset: int = TAG_FILE_HEADER_SIZE
+        entries: List[TagFileEntry] = []
+        for _ in range(tag_file.entry_count):
+            entry: TagFileEntry
+            entry, offset = TagFileEntry.from_buffer(
+                data, offset, db_file_type=db_file_type, string_cache=string_cache
+            )
+            entries.append(entry)
+
+        tag_file.add_entries(entries)
+
+        # Keep ALL entries read from the file, for the entries_by_offset lookup.
+        tag_file._entries_on_disk = entries
+
+        # Store entries in entries_by_tag_data as canonical lookup.
+        if duplicates_possible:
+            tag_file.entries_by_tag_data.update((entry.key, entry) for entry in entries)
+        else:
+            tag_file.entries_by_tag_data.update(
+                (entry.tag_data, entry) for entry in entries
+            )
         return tag_file
 
     def to_file(self, filepath: str, sort_map: Optional[Dict[str, str]] = None) -> None:
@@ -107,11 +144,6 @@ class TagFile:
         Recalculates datasize and entry_count before writing based on current entries.
         """
         self.entry_count = len(self.entries)
-        self.datasize = sum(entry.size for entry in self.entries)
-
-        # Clear and rebuild lookup dictionaries to reflect the state of entries being written.
-        self.entries_by_offset = {}
-        self.entries_by_tag_data = {}
 
         # Sort entries before writing if the TagFile type expects it (e.g., genre, artist).
         # However, filename databases are not sorted by tag data.
@@ -123,31 +155,56 @@ class TagFile:
                 self.entries.sort(key=lambda e: sort_map.get(e.tag_data, e.tag_data))
             else:
                 # Sort entries by tag_data (case-insensitive)
-                self.entries.sort(key=lambda e: e.tag_data.lower())
+                self.entries.sort(key=lambda e: e.lower_tag_data)
+
+        # Work out the layout column by column: each string is encoded once, and the
+        # entry sizes, datasize and offsets are all derived from those columns.
+        is_filename_db: bool = self.db_file_type.is_filename_db
+        # The encoded bytes only live for this write, rather than on each entry.
+        encoded_column: List[bytes] = [
+            entry.tag_data.encode(ENCODING) for entry in self.entries
+        ]
+        size_column: List[int] = [
+            TAG_FILE_ENTRY_HEADER_SIZE
+            + padded_tag_length(len(encoded_data) + 1, is_filename_db)
+            for encoded_data in encoded_column
+        ]
+        self.datasize = sum(size_column)
+        offset_column: Iterator[int] = accumulate(
+            size_column, initial=TAG_FILE_HEADER_SIZE
+        )
 
-        with open(filepath, "wb") as f:
-            # Write TagFile header.
-            write_uint32(f, self.magic)
-            write_uint32(f, self.datasize)
-            write_uint32(f, self.entry_count)
+        # Build the whole file in memory, so it can be written out in one go.
+        buffer: bytearray = bytearray(TAG_FILE_HEADER_SIZE + self.datasize)
+        _HEADER_STRUCT.pack_into(buffer, 0, self.magic, self.datasize, self.entry_count)
 
-            # Write each TagFileEntry.
-            current_offset: int = f.tell()
-            for entry in self.entries:
-                entry.is_filename_db = self.db_file_type.is_filename_db
+        for entry, encoded_data, offset in zip(
+            self.entries, encoded_column, offset_column
+        ):
+            entry.is_filename_db = is_filename_db
 
-                # Update entry's offset to its new position in this file.
-                entry.offset_in_file = current_offset
+            # Update entry's offset to its new position in this file.
+            entry.offset_in_file = offset
+            entry.pack_into(buffer, offset, encoded_data)
 
-                entry_bytes: bytes = entry.to_bytes()
-                f.write(entry_bytes)
+        # Rebuild lookups to reflect the newly assigned offsets and data.
+        self._entries_on_disk = list(self.entries)
+        self.__dict__.pop("entries_by_offset", None)
+        if self.duplicates_possible:
+            self.entries_by_tag_data = {entry.key: entry for entry in self.entries}
+        else:
+            self.entries_by_tag_data = {entry.tag_data: entry for entry in self.entries}
 
-                current_offset += len(entry_bytes)
-                key = entry.key if self.duplicates_possible else entry.tag_data
+        with open(filepath, "wb") as f:
+            f.write(buffer)
 
-                # Update internal lookups with the newly assigned offset and data.
-                self.entries_by_offset[entry.offset_in_file] = entry
-                self.entries_by_tag_data[key] = entry
+    @cached_property
+    def entries_by_offset(self) -> Dict[int, TagFileEntry]:
+        """
+        Maps offsets to TagFileEntry objects for quick lookup by byte offset.
+        Built on first access, as only callers resolving offsets need it.
+        """
+        return {entry.offset_in_file: entry for entry in self._entries_on_disk}
 
     def get_entry_by_offset(self, offset: int) -> Optional[TagFileEntry]:
         """Retrieves a TagFileEntry by its byte offset in the file."""
@@ -166,13 +223,13 @@ class TagFile:
         This method is primarily used when building a database from scratch or adding
         new canonical genre strings during modification.
         """
-        entry_key: str = entry.tag_data
+        entry_key: Union[str, bytes] = entry.tag_data
 
         if self.duplicates_possible:
             entry_key = entry.key
         else:
             # If duplicates are not allowed, we use the tag_data directly.
-            entry_key = entry.tag_data.lower()
+            entry_key = entry.lower_tag_data
 
         # If the string content is not already in our canonical map, add this entry.
         if entry_key not in self.entries_by_tag_data:
@@ -186,6 +243,22 @@ class TagFile:
             existing_canonical_entry: TagFileEntry = self.entries_by_tag_data[entry_key]
             return existing_canonical_entry
 
+    def add_entries(self, entries: Iterable[TagFileEntry]) -> None:
+        """
+        Adds several TagFileEntry objects to this TagFile, as add_entry would one at
+        a time, but without a method call per entry.
+        """
+        entries_by_tag_data = self.entries_by_tag_data
+        duplicates_possible: bool = self.duplicates_possible
+
+        for entry in entries:
+            entry_key: Union[str, bytes] = (
+                entry.key if duplicates_possible else entry.lower_tag_data
+            )
+            if entry_key not in entries_by_tag_data:
+                self.entries.append(entry)
+                entries_by_tag_data[entry_key] = entry
+
     def __repr__(self) -> str:
         """Provides a developer-friendly string representation of the TagFile object."""
         tag_name: str = TAG_TYPES[self.db_file_type.tag_index]
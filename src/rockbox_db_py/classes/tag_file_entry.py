@@ -5,13 +5,87 @@
 # and contains metadata about its position in the file and its unique identifier.
 
 import struct
-import math
-from typing import Optional
+from typing import Dict, Optional, Tuple, Union
 
 from rockbox_db_py.classes.db_file_type import RockboxDBFileType
 from rockbox_db_py.utils.defs import ENCODING, TAGFILE_ENTRY_CHUNK_LENGTH
 from rockbox_db_py.utils.struct_helpers import ENDIANNESS_CHAR
-from rockbox_db_py.utils.struct_helpers import read_uint32
+
+
+# The fixed-size 8-byte entry header: tag_length and idx_id.
+_ENTRY_HEADER = struct.Struct(ENDIANNESS_CHAR + "II")
+TAG_FILE_ENTRY_HEADER_SIZE = _ENTRY_HEADER.size
+
+# Comment DB entries of 40 bytes hold 10 binary little-endian integers, which are
+# shown as space separated hex words, e.g. "00000EDA 00000B79 ...".
+_COMMENT_INTS = struct.Struct("<10I")
+_COMMENT_INTS_FORMAT = " ".join(["{:08X}"] * 10)
+
+
+def padded_tag_length(data_with_null_len: int, is_filename_db: bool) -> int:
+    """
+    Returns the padded length of an entry's data, including its null terminator.
+    Filename database entries are not padded, all others are padded to a multiple
+    of TAGFILE_ENTRY_CHUNK_LENGTH.
+    """
+    if is_filename_db:
+        return data_with_null_len
+    chunk_count: int = -(-data_with_null_len // TAGFILE_ENTRY_CHUNK_LENGTH)
+    return chunk_count * TAGFILE_ENTRY_CHUNK_LENGTH
+
+
+def _decode_tag_data(
+    raw: bytes,
+    start: int,
+    end: int,
+    db_file_type: Optional[RockboxDBFileType],
+    string_cache: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Decodes the tag data stored in raw[start:end] (null terminated, then padded).
+    Only the part up to the null terminator is copied out of raw.
+
+    If string_cache is given, decoded text equal to a string already in it is
+    replaced with that string, so repeated values share one object.
+    """
+    is_comment_db: bool = db_file_type == RockboxDBFileType.COMMENT
+    decoded_tag_data: str
+    null_byte_pos: int = raw.find(b"\x00", start, end)
+
+    if null_byte_pos != -1:
+        # If it's a comment DB and the null-terminated part is 40 bytes, try binary unpack
+        if is_comment_db and null_byte_pos - start == _COMMENT_INTS.size:
+            try:
+                # Attempt to unpack as 10 unsigned 32-bit integers (little-endian assumed)
+                ints = _COMMENT_INTS.unpack_from(raw, start)
+                decoded_tag_data = _COMMENT_INTS_FORMAT.format(*ints)
+            except struct.error:
+                # Fallback if unpacking fails, just hex representation
+                decoded_tag_data = raw[start:null_byte_pos].hex().upper()
+        else:
+            # Standard UTF-8 decode for other tags or non-matching comment patterns
+            try:
+                decoded_tag_data = raw[start:null_byte_pos].decode(ENCODING)
+                if string_cache is not None:
+                    decoded_tag_data = string_cache.setdefault(
+                        decoded_tag_data, decoded_tag_data
+                    )
+            except UnicodeDecodeError:
+                # Fallback for non-UTF-8 data with null terminator.
+                decoded_tag_data = raw[start:null_byte_pos].hex().upper()
+    else:
+        # If no null byte, and it's a comment DB and raw data is 40 bytes, try binary unpack
+        if is_comment_db and end - start == _COMMENT_INTS.size:
+            try:
+                ints = _COMMENT_INTS.unpack_from(raw, start)
+                decoded_tag_data = _COMMENT_INTS_FORMAT.format(*ints)
+            except struct.error:
+                decoded_tag_data = raw[start:end].hex().upper()
+        else:
+            # Fallback for other non-null-terminated data, represent as hex string
+            decoded_tag_data = raw[start:end].hex().upper()
+
+    return decoded_tag_data
 
 
 class TagFileEntry:
@@ -21,12 +95,23 @@ class TagFileEntry:
     is stored on disk within a Rockbox Tag File (database_X.tcd).
     """
 
+    # A database holds an entry per distinct tag value (and per track for titles and
+    # filenames), so avoid a per-instance __dict__.
+    __slots__ = (
+        "tag_data",
+        "idx_id",
+        "offset_in_file",
+        "db_file_type",
+        "is_filename_db",
+        "unique_id",
+    )
+
     def __init__(
         self,
         tag_data: str = "",
         idx_id: int = 0xFFFFFFFF,
         offset_in_file: Optional[int] = None,
-        unique_id: Optional[str] = None,
+        unique_id: Optional[bytes] = None,
         db_file_type: Optional[RockboxDBFileType] = None,
     ):
         self.tag_data = tag_data
@@ -41,7 +126,7 @@ class TagFileEntry:
         self.unique_id = unique_id
 
     @property
-    def key(self) -> str:
+    def key(self) -> Union[str, bytes]:
         """
         Returns a unique key for this entry based on its tag data and idx_id.
         This is used for de-duplication and quick lookups.
@@ -50,6 +135,15 @@ class TagFileEntry:
             return self.unique_id
         return self.tag_data
 
+    @property
+    def lower_tag_data(self) -> str:
+        """
+        Returns the lowercased tag data, used for case-insensitive de-duplication
+        and sorting. Not stored on the entry, so it can't go stale if tag_data is
+        replaced, and doesn't keep a second copy of every string alive.
+        """
+        return self.tag_data.lower()
+
     @classmethod
     def from_file(
         cls, f, db_file_type: Optional[RockboxDBFileType] = None
@@ -70,8 +164,10 @@ class TagFileEntry:
         """
         initial_offset: int = f.tell()
 
-        tag_length: int = read_uint32(f)
-        idx_id: int = read_uint32(f)
+        raw_header: bytes = f.read(_ENTRY_HEADER.size)
+        if len(raw_header) != _ENTRY_HEADER.size:
+            raise ValueError("Not enough data to read a 32-bit unsigned integer.")
+        tag_length, idx_id = _ENTRY_HEADER.unpack(raw_header)
 
         raw_tag_data: bytes = f.read(tag_length)
         if len(raw_tag_data) < tag_length:
@@ -79,79 +175,92 @@ class TagFileEntry:
                 f"Not enough bytes to read tag data. Expected {tag_length}, got {len(raw_tag_data)}"
             )
 
-        decoded_tag_data: str
-        null_byte_pos: int = raw_tag_data.find(b"\x00")
-        is_comment_db: bool = db_file_type == RockboxDBFileType.COMMENT
-
-        if null_byte_pos != -1:
-            # If it's a comment DB and the null-terminated part is 40 bytes, try binary unpack
-            if is_comment_db and null_byte_pos == 40:
-                try:
-                    # Attempt to unpack as 10 unsigned 32-bit integers (little-endian assumed)
-                    ints = struct.unpack("<10I", raw_tag_data[:null_byte_pos])
-                    decoded_tag_data = " ".join(
-                        f"{i:08X}" for i in ints
-                    )  # Format as "00000EDA 00000B79 ..."
-                except struct.error:
-                    # Fallback if unpacking fails, just hex representation
-                    decoded_tag_data = "".join(
-                        f"{b:02X}" for b in raw_tag_data[:null_byte_pos]
-                    )
-            else:
-                # Standard UTF-8 decode for other tags or non-matching comment patterns
-                try:
-                    decoded_tag_data = raw_tag_data[:null_byte_pos].decode(ENCODING)
-                except UnicodeDecodeError:
-                    # Fallback for non-UTF-8 data with null terminator.
-                    decoded_tag_data = "".join(
-                        f"{b:02X}" for b in raw_tag_data[:null_byte_pos]
-                    )
-        else:
-            # If no null byte, and it's a comment DB and raw data is 40 bytes, try binary unpack
-            if is_comment_db and len(raw_tag_data) == 40:
-                try:
-                    ints = struct.unpack("<10I", raw_tag_data)
-                    decoded_tag_data = " ".join(f"{i:08X}" for i in ints)
-                except struct.error:
-                    decoded_tag_data = "".join(f"{b:02X}" for b in raw_tag_data)
-            else:
-                # Fallback for other non-null-terminated data, represent as hex string
-                decoded_tag_data = "".join(f"{b:02X}" for b in raw_tag_data)
-
         return cls(
-            tag_data=decoded_tag_data,
+            tag_data=_decode_tag_data(raw_tag_data, 0, tag_length, db_file_type),
             idx_id=idx_id,
             db_file_type=db_file_type,
             offset_in_file=initial_offset,
         )
 
-    def to_bytes(self) -> bytes:
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: bytes,
+        offset: int,
+        db_file_type: Optional[RockboxDBFileType] = None,
+        string_cache: Optional[Dict[str, str]] = None,
+    ) -> Tuple["TagFileEntry", int]:
         """
-        Converts the TagFileEntry object into its raw byte representation for disk.
-        Applies padding and null termination based on Rockbox specifications.
+        Reads a TagFileEntry from an in-memory copy of a Tag File, such as the whole
+        file read at once. Equivalent to from_file, without a file read per field.
+
+        Args:
+            buffer: The raw bytes of the Tag File.
+            offset: Offset of the start of the entry within buffer.
+            db_file_type: Optional RockboxDBFileType instance, as for from_file.
+            string_cache: Optional dict used to share equal decoded strings between
+                          entries (see TagFile.from_file).
+
+        Returns:
+            The new TagFileEntry instance, and the offset just past its end.
+
+        Raises:
+            EOFError: If the entry runs past the end of the buffer.
         """
-        encoded_data: bytes = self.tag_data.encode(ENCODING)
-        data_with_null: bytes = encoded_data + b"\x00"
+        if offset + _ENTRY_HEADER.size > len(buffer):
+            raise ValueError("Not enough data to read a 32-bit unsigned integer.")
+        tag_length, idx_id = _ENTRY_HEADER.unpack_from(buffer, offset)
 
-        # Calculate the padded length of the data portion, applying specific rules for filename database.
-        if self.is_filename_db:
-            padded_length: int = len(data_with_null)
-        else:
-            padded_length = (
-                int(math.ceil(len(data_with_null) / TAGFILE_ENTRY_CHUNK_LENGTH))
-                * TAGFILE_ENTRY_CHUNK_LENGTH
+        data_start: int = offset + _ENTRY_HEADER.size
+        data_end: int = data_start + tag_length
+        if data_end > len(buffer):
+            raise EOFError(
+                f"Not enough bytes to read tag data. Expected {tag_length}, got {len(buffer) - data_start}"
             )
 
-        # Pad with 'X' bytes as seen in tagcache.c for unused space.
-        padded_data: bytes = data_with_null.ljust(padded_length, b"X")
+        entry: TagFileEntry = cls(
+            tag_data=_decode_tag_data(
+                buffer, data_start, data_end, db_file_type, string_cache
+            ),
+            idx_id=idx_id,
+            db_file_type=db_file_type,
+            offset_in_file=offset,
+        )
+        return entry, data_end
+
+    def pack_into(
+        self, buffer: bytearray, offset: int, encoded_data: Optional[bytes] = None
+    ) -> int:
+        """
+        Writes the raw byte representation of this entry into buffer at offset,
+        as to_bytes would return it, and returns the offset just past its end.
+        encoded_data may be given if the tag data has already been encoded.
+        """
+        if encoded_data is None:
+            encoded_data = self.tag_data.encode(ENCODING)
+        padded_length: int = padded_tag_length(
+            len(encoded_data) + 1, self.is_filename_db
+        )
 
         # Pack the fixed-size 8-byte header (tag_length and idx_id) with endianness.
-        packed_header: bytes = struct.pack(
-            ENDIANNESS_CHAR + "II",
-            padded_length,
-            self.idx_id,
-        )
-        return packed_header + padded_data
+        _ENTRY_HEADER.pack_into(buffer, offset, padded_length, self.idx_id)
+
+        # Null terminate, then pad with 'X' bytes as seen in tagcache.c.
+        data_start: int = offset + _ENTRY_HEADER.size
+        data_end: int = data_start + len(encoded_data)
+        entry_end: int = data_start + padded_length
+        buffer[data_start:data_end] = encoded_data
+        buffer[data_end:entry_end] = b"\x00".ljust(entry_end - data_end, b"X")
+        return entry_end
+
+    def to_bytes(self) -> bytes:
+        """
+        Converts the TagFileEntry object into its raw byte representation for disk.
+        Applies padding and null termination based on Rockbox specifications.
+        """
+        buffer: bytearray = bytearray(self.size)
+        self.pack_into(buffer, 0)
+        return bytes(buffer)
 
     @property
     def tag_length(self) -> int:
@@ -159,16 +268,13 @@ class TagFileEntry:
         Calculates the 'tag_length' field value as written to the file,
         including null termination and padding.
         """
-        encoded_data: bytes = self.tag_data.encode(ENCODING)
-        data_with_null_len: int = len(encoded_data) + 1
-
-        if self.is_filename_db:
-            return data_with_null_len
+        # ASCII text encodes to one byte per character, so its length is known
+        # without encoding it.
+        if self.tag_data.isascii():
+            encoded_length: int = len(self.tag_data)
         else:
-            return (
-                int(math.ceil(data_with_null_len / TAGFILE_ENTRY_CHUNK_LENGTH))
-                * TAGFILE_ENTRY_CHUNK_LENGTH
-            )
+            encoded_length = len(self.tag_data.encode(ENCODING))
+        return padded_tag_length(encoded_length + 1, self.is_filename_db)
 
     @property
     def size(self) -> int:
@@ -176,7 +282,7 @@ class TagFileEntry:
         Returns the total byte size of this TagFileEntry on disk,
         including its 8-byte header and the padded data.
         """
-        return self.tag_length + 8
+        return self.tag_length + _ENTRY_HEADER.size
 
     def __repr__(self) -> str:
         """Provides a developer-friendly string representation."""
@@ -5,15 +5,21 @@
 from multiprocessing import Pool
 import os
 import shutil
-from typing import Optional, List, Dict, Union
+from typing import Optional, List, Dict, Iterator, Tuple, Union
 
 from rockbox_db_py.classes.db_file_type import RockboxDBFileType
 from rockbox_db_py.classes.index_file import IndexFile
 from rockbox_db_py.classes.index_file_entry import IndexFileEntry
-from rockbox_db_py.classes.music_file import MusicFile, SUPPORTED_MUSIC_EXTENSIONS
+from rockbox_db_py.classes.music_file import (
+    MusicFile,
+    SUPPORTED_MUSIC_EXTENSIONS,
+    parse_music_file_chunk,
+)
+from rockbox_db_py.classes.music_file_cache import MusicFileCache
 from rockbox_db_py.classes.tag_file import TagFile
 from rockbox_db_py.classes.tag_file_entry import TagFileEntry
 from rockbox_db_py.utils.defs import TagTypeEnum, FILE_TAG_INDICES, TAG_COUNT
+from rockbox_db_py.utils.utils import get_file_extension
 
 from tqdm import tqdm
 
@@ -176,11 +182,45 @@ def write_rockbox_database(
         raise
 
 
-def _process_file(path: str) -> Optional[MusicFile]:
+def _find_music_files(
+    directory_path: str, extensions: List[str]
+) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
     """
-    Helper function to process a single audio file path.
+    Recursively yields (path, stat result) for every file under directory_path with
+    one of the given extensions. Like os.walk, symlinked directories are not followed
+    and unreadable directories are skipped.
+
+    The stat results come from the os.scandir entries, which on Windows are filled in
+    by the directory listing itself, so the files don't need to be stat'ed again.
     """
-    return MusicFile.from_filepath(path)
+    pending_dirs: List[str] = [directory_path]
+    while pending_dirs:
+        try:
+            dir_entries = os.scandir(pending_dirs.pop())
+        except OSError:
+            continue
+
+        with dir_entries:
+            for entry in dir_entries:
+                try:
+                    is_dir: bool = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if not entry.is_symlink():
+                        pending_dirs.append(entry.path)
+                    continue
+
+                if get_file_extension(entry.name) not in extensions:
+                    continue
+
+                try:
+                    stat_info: Optional[os.stat_result] = entry.stat()
+                except OSError:
+                    # Leave it to MusicFile.from_filepath to report the error.
+                    stat_info = None
+                yield entry.path, stat_info
 
 
 def scan_music_directory(
@@ -189,6 +229,7 @@ def scan_music_directory(
     show_progress: bool = True,
     custom_progress_callback: Optional[callable] = None,
     extensions: List[str] = SUPPORTED_MUSIC_EXTENSIONS,
+    cache_path: Optional[str] = None,
 ) -> List[MusicFile]:
     """
     Recursively scans a directory for music files and returns a list of MusicFile objects.
@@ -198,42 +239,83 @@ def scan_music_directory(
         directory_path: The root directory to scan.
         num_processes: Number of parallel processes to use. If None, uses CPU count.
         show_progress: If True, shows progress bar for file processing.
+        cache_path: Optional path to a MusicFileCache database. If given, files that
+                    are unchanged since they were cached are not re-parsed, and newly
+                    parsed files are added to the cache.
 
     Returns:
         A list of MusicFile objects found and successfully parsed.
     """
 
     # Phase 1: Collect all potential audio file paths (filtered by extension)
-    all_potential_audio_paths: List[str] = []
+    all_potential_audio_paths: List[Tuple[str, Optional[os.stat_result]]] = list(
+        _find_music_files(directory_path, extensions)
+    )
 
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            file_path: str = os.path.join(root, file)
-            file_extension: str = os.path.splitext(file_path)[1].lower()
+    music_files: List[MusicFile] = []
 
-            if file_extension in extensions:
-                all_potential_audio_paths.append(file_path)
+    # Shared across all parsed files, so repeated tag values are stored only once.
+    tag_string_cache: Dict[str, str] = {}
+
+    # Reuse any cached files that haven't changed, and only parse the rest.
+    cache: Optional[MusicFileCache] = (
+        MusicFileCache(cache_path) if cache_path is not None else None
+    )
+    paths_to_parse: List[Tuple[str, Optional[os.stat_result]]] = []
+    for path, stat_info in all_potential_audio_paths:
+        cached_file: Optional[MusicFile] = (
+            cache.get(path, stat_info)
+            if cache is not None and stat_info is not None
+            else None
+        )
+        if cached_file is not None:
+            cached_file.share_tag_strings(tag_string_cache)
+            music_files.append(cached_file)
+        else:
+            paths_to_parse.append((path, stat_info))
 
     # Phase 2: Parallel parse audio files
     if num_processes is None or num_processes <= 0:
         num_processes = os.cpu_count()
 
-    music_files: List[MusicFile] = []
+    parsed_files: List[MusicFile] = []
+
+    # Hand out paths in chunks to amortise the per-task IPC cost, while keeping
+    # enough chunks per process for even load balancing and smooth progress updates.
+    # Each chunk's results come back as a single batch of rows.
+    chunksize: int = max(1, len(paths_to_parse) // (num_processes * 8))
+    chunks: List[List[Tuple[str, Optional[os.stat_result]]]] = [
+        paths_to_parse[start : start + chunksize]
+        for start in range(0, len(paths_to_parse), chunksize)
+    ]
 
-    with Pool(processes=num_processes) as pool:
-        # Use imap_unordered for better memory management and progress reporting for large lists
-        for result in tqdm(
-            pool.imap_unordered(_process_file, all_potential_audio_paths),
-            total=len(all_potential_audio_paths),
-            disable=not show_progress,
+    try:
+        with (
+            Pool(processes=num_processes) as pool,
+            tqdm(total=len(paths_to_parse), disable=not show_progress) as progress_bar,
         ):
-            if result:
-                music_files.append(result)
-            if custom_progress_callback:
-                custom_progress_callback(
-                    "progress",
-                    int((len(music_files) / len(all_potential_audio_paths)) * 100),
-                )
+            # Use imap_unordered for better memory management and progress reporting for large lists
+            for processed_count, rows in pool.imap_unordered(
+                parse_music_file_chunk, chunks
+            ):
+                for row in rows:
+                    result: MusicFile = MusicFile.from_row(row)
+                    result.share_tag_strings(tag_string_cache)
+                    music_files.append(result)
+                    parsed_files.append(result)
+
+                progress_bar.update(processed_count)
+                if custom_progress_callback:
+                    custom_progress_callback(
+                        "progress",
+                        int((len(music_files) / len(all_potential_audio_paths)) * 100),
+                    )
+
+        if cache is not None:
+            cache.add_many(parsed_files)
+    finally:
+        if cache is not None:
+            cache.close()
 
     if not music_files:
         print("No valid music files found or parsed successfully.")
@@ -297,7 +379,7 @@ def build_rockbox_database_from_music_files(
         # will default to 0, which is acceptable for a new database.
 
         # Generate a unique ID for this entry.
-        unique_id: str = music_file.generate_unique_id()
+        unique_id: bytes = music_file.generate_unique_id()
 
         # Populate file-based string tags.
         for tag_idx in FILE_TAG_INDICES:
@@ -365,14 +447,14 @@ def copy_metadata_between_databases(source_db: IndexFile, target_db: IndexFile)
 
     # First, build a map for the old database, from music path to IndexFileEntry.
     old_db_map: Dict[str | int | None, IndexFileEntry] = {
-        entry.get_parsed_tag_value(TagTypeEnum.filename): entry
+        source_db.resolve_tag(entry, TagTypeEnum.filename): entry
         for entry in source_db.entries
     }
 
     # Now, iterate through the target database entries and copy metadata.
     missed_count: int = 0
     for target_entry in target_db.entries:
-        current_filename = target_entry.get_parsed_tag_value(TagTypeEnum.filename)
+        current_filename = target_db.resolve_tag(target_entry, TagTypeEnum.filename)
 
         if current_filename not in old_db_map:
             missed_count += 1
@@ -1,10 +1,14 @@
 # Basic struct helper, to help with struct packing and unpacking.
 
 import struct
+import sys
 
 # Assume we are dealing with little-endian byte order
 ENDIANNESS_CHAR = "<"
 
+# Whether native-order buffers (e.g. array.array) need swapping to match ENDIANNESS_CHAR.
+NEEDS_BYTESWAP = (ENDIANNESS_CHAR == "<") != (sys.byteorder == "little")
+
 
 def read_uint32(file_obj):
     """Read a 32-bit unsigned integer from the data at the given offset."""
@@ -1,12 +1,16 @@
 # General purpose utility functions for Rockbox database management.
 
+import os
 import time
+from functools import lru_cache
 
 
+@lru_cache(maxsize=4096)
 def mtime_to_fat(mtime: int) -> int:
     """
     Converts a Unix timestamp (mtime from os.stat) to Rockbox's FAT32 mtime format.
     The FAT32 mtime schema is detailed in the fat32 documentation.
+    Cached, as files are often copied or tagged in bulk and share timestamps.
     """
     # Deconstruct Unix timestamp into local time components
     year, month, day, hour, minute, second = time.localtime(mtime)[:-3]
@@ -62,3 +66,25 @@ def fat_to_mtime(fat: int) -> int:
         time.mktime((year, month, day, hour, minute, second, 0, 0, -1))
     )
     return unix_timestamp
+
+
+def get_file_extension(filepath: str) -> str:
+    """
+    Returns the lowercased extension of a path (including the dot), or "" if none.
+    Equivalent to os.path.splitext(filepath)[1].lower(), but without building the
+    intermediate tuple, as it is called for every file during a scan.
+    """
+    sep_index: int = filepath.rfind(os.sep)
+    if os.altsep:
+        sep_index = max(sep_index, filepath.rfind(os.altsep))
+
+    dot_index: int = filepath.rfind(".")
+    if dot_index <= sep_index:
+        return ""
+
+    # Like splitext, leading dots of the file name do not start an extension.
+    name_start: int = sep_index + 1
+    if filepath.count(".", name_start, dot_index) == dot_index - name_start:
+        return ""
+
+    return filepath[dot_index:].lower()
@@ -30,6 +30,8 @@
 # --stats                    After building the database, print statistics by loading the database and printing stats.
 # --no-progress              Disable progress bar when scanning music files.
 # --old-db                   If provided, copy over some of the basic metadata from an old database.
+# --cache-file <cache_file>  Path to a metadata cache file. Unchanged music files found in the
+#                            cache are not re-parsed, and new or changed files are added to it.
 
 
 import argparse
@@ -99,6 +101,12 @@ def parse_args():
         action="store_true",
         help="If provided, copy over some of the basic metadata from an old database.",
     )
+    parser.add_argument(
+        "--cache-file",
+        type=str,
+        default=None,
+        help="Path to a metadata cache file, used to skip re-parsing unchanged music files.",
+    )
 
     args = parser.parse_args()
     return args
@@ -112,7 +120,10 @@ def main():
 
     print(f"Processing music files from: {input_music_dir}")
     music_files = scan_music_directory(
-        input_music_dir, num_processes=args.num_processes, show_progress=args.progress
+        input_music_dir,
+        num_processes=args.num_processes,
+        show_progress=args.progress,
+        cache_path=args.cache_file,
     )
 
     if not music_files: